@@ -1,51 +1,117 @@
 # Step 1 - Import required modules
 import csv
+import gc
+import heapq
+import io
 import os
-import uuid
+from collections import namedtuple
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 import textwrap
 import sys
 
 # Step 2 - Define constants and CSV structure
 CSV_FILE = "expenses.csv"
 CSV_FIELDS = ["id", "date", "category", "amount", "description"]
+# One expense record; a tuple subclass, so rows carry no per-row dict
+Expense = namedtuple("Expense", CSV_FIELDS)
+IDX_ID, IDX_DATE, IDX_CATEGORY, IDX_AMOUNT, IDX_DESC = range(len(CSV_FIELDS))
+# New dates are stored zero-padded in this format and read_all() pads any
+# older ones, so comparing loaded date strings orders them like the dates
 DATE_FORMAT = "%Y-%m-%d"
 
+# Parsed rows are cached until the CSV file's mtime or size changes
+_CACHE = {"key": None, "rows": None, "id8_index": None, "paise": None, "date_ordered": None}
+
 # Step 3 - Ensure the CSV file exists
 def ensure_csv():
     if not os.path.isfile(CSV_FILE):
         with open(CSV_FILE, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
-            writer.writeheader()
+            csv.writer(f).writerow(CSV_FIELDS)
 
 # Step 4 - Read all expense records
 def read_all():
     ensure_csv()
-    rows = []
+    st = os.stat(CSV_FILE)
+    key = (st.st_mtime_ns, st.st_size)
+    if key == _CACHE["key"]:
+        return _CACHE["rows"]
+    # Decode the whole file in one read, then parse from memory
     with open(CSV_FILE, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for r in reader:
-            rows.append(r)
+        data = f.read()
+    rows = []
+    id8_index = {}
+    intern = sys.intern
+    make = Expense._make
+    lf_data = data.replace("\r\n", "\n")
+    if '"' in data or "\r" in lf_data:
+        records = csv.reader(io.StringIO(data, newline=""))
+    else:
+        # Nothing is quoted and every line ends in \n or \r\n, so no field
+        # holds a comma or line break and plain str.split() parses the file
+        # much faster than csv.reader
+        records = (line.split(",") for line in lf_data.split("\n") if line)
+    # The parse allocates only acyclic objects, so pausing the cyclic
+    # collector avoids repeated generation scans over the growing list
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        next(records, None)  # header
+        for rec in records:
+            if not rec:
+                continue
+            if len(rec) != len(CSV_FIELDS):
+                rec = (rec + [""] * len(CSV_FIELDS))[:len(CSV_FIELDS)]
+            # Older files may hold dates typed without zero padding, such
+            # as 2024-2-15; bring them into canonical form once, on load
+            d = rec[IDX_DATE]
+            if len(d) != 10 or d[4] != "-" or d[7] != "-":
+                parsed = parse_date(d.strip())
+                if parsed:
+                    rec[IDX_DATE] = parsed.strftime(DATE_FORMAT)
+            # Share one string object per distinct category/date value
+            rec[IDX_DATE] = intern(rec[IDX_DATE])
+            rec[IDX_CATEGORY] = intern(rec[IDX_CATEGORY])
+            id8_index.setdefault(rec[IDX_ID][:8], []).append(len(rows))
+            rows.append(make(rec))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    _CACHE["key"] = key
+    _CACHE["rows"] = rows
+    _CACHE["id8_index"] = id8_index
+    _CACHE["paise"] = None
+    _CACHE["date_ordered"] = None
     return rows
 
+# Step 4b - Find the row positions whose id starts with a prefix
+def find_by_id(id_prefix):
+    rows = read_all()
+    if len(id_prefix) == 8:
+        return rows, _CACHE["id8_index"].get(id_prefix, [])
+    return rows, [i for i, r in enumerate(rows) if r.id.startswith(id_prefix)]
+
 # Step 5 - Write all records back to CSV
 def write_all(rows):
     with open(CSV_FILE, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
-        writer.writeheader()
-        for r in rows:
-            writer.writerow(r)
+        writer = csv.writer(f)
+        writer.writerow(CSV_FIELDS)
+        writer.writerows(rows)
+    _CACHE["key"] = None
 
 # Step 6 - Parse amount entered by user
 def parse_amount(s):
     try:
         a = Decimal(s)
+        if not a.is_finite():
+            return None
         return a.quantize(Decimal("0.01"))
     except (InvalidOperation, ValueError):
         return None
 
-# Step 7 - Parse date entered by user
+# Step 7 - Parse date entered by user (memoized; many entries share a date)
+@lru_cache(maxsize=4096)
 def parse_date(s):
     try:
         dt = datetime.strptime(s, DATE_FORMAT)
@@ -53,9 +119,49 @@ def parse_date(s):
     except Exception:
         return None
 
+# Step 7b - Convert stored amounts to integer paise and back for fast totals
+# (None for a stored amount that is not a finite whole number of paise)
+def to_paise(s):
+    whole, sep, frac = s.partition(".")
+    digits = whole[1:] if whole[:1] in ("+", "-") else whole
+    if sep and len(frac) == 2 and frac.isdigit() and (digits == "" or digits.isdigit()):
+        try:
+            return int(whole + frac)
+        except ValueError:
+            pass
+    try:
+        p = Decimal(s) * 100
+        if not p.is_finite() or p != p.to_integral_value():
+            return None
+        return int(p)
+    except (InvalidOperation, ValueError):
+        return None
+
+def format_paise(p):
+    sign = "-" if p < 0 else ""
+    p = abs(p)
+    return f"{sign}{p // 100}.{p % 100:02d}"
+
+# Step 7c - Read all records along with their amounts in paise, converted once per load
+def read_amounts():
+    rows = read_all()
+    if _CACHE["paise"] is None:
+        _CACHE["paise"] = [to_paise(r.amount) for r in rows]
+    return rows, _CACHE["paise"]
+
 # Step 8 - Format a single expense record for display
+# Column widths are baked into the template once, at import time; Expense
+# is a tuple, so the whole record is applied to it in a single operation
+ID_WIDTH = 8
+CATEGORY_WIDTH = 12
+AMOUNT_WIDTH = 8
+ROW_FORMAT = (
+    f"%.{ID_WIDTH}s | %s | %-{CATEGORY_WIDTH}.{CATEGORY_WIDTH}s"
+    f" | ₹%{AMOUNT_WIDTH}s | %s"
+)
+
 def format_row(r):
-    return f"{r['id'][:8]} | {r['date']} | {r['category'][:12]:12} | ₹{r['amount']:>8} | {r['description']}"
+    return ROW_FORMAT % r
 
 # Step 9 - Add a new expense entry
 def add_expense():
@@ -64,10 +170,11 @@ def add_expense():
     if date_in == "":
         date = datetime.today().date().strftime(DATE_FORMAT)
     else:
-        if not parse_date(date_in):
+        d = parse_date(date_in)
+        if not d:
             print("Invalid date format. Use YYYY-MM-DD.")
             return
-        date = date_in
+        date = d.strftime(DATE_FORMAT)
     category = input("Category (e.g., food, travel, bills): ").strip() or "misc"
     amount_in = input("Amount (numbers only): ").strip()
     amount = parse_amount(amount_in)
@@ -75,16 +182,29 @@ def add_expense():
         print("Invalid amount.")
         return
     description = input("Short description: ").strip()
-    row = {
-        "id": str(uuid.uuid4()),
-        "date": date,
-        "category": category,
-        "amount": str(amount),
-        "description": description,
-    }
-    rows = read_all()
-    rows.append(row)
-    write_all(rows)
+    row = Expense(
+        id=os.urandom(16).hex(),
+        date=date,
+        category=category,
+        amount=str(amount),
+        description=description,
+    )
+    ensure_csv()
+    # A hand-edited file may be empty or lack a final line break; appending
+    # straight after that would lose the header or merge into the last row
+    last = b""
+    with open(CSV_FILE, "rb") as f:
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            last = f.read(1)
+    with open(CSV_FILE, "a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if not last:
+            writer.writerow(CSV_FIELDS)
+        elif last != b"\n":
+            f.write("\r\n")
+        writer.writerow(row)
+    _CACHE["key"] = None
     print("Expense added successfully.")
 
 # Step 10 - View all or recent expenses
@@ -94,32 +214,41 @@ def view_expenses(limit=None):
         print("\nNo expenses found.")
         return
     print("\nAll expenses:")
-    rows_sorted = sorted(rows, key=lambda r: r["date"], reverse=True)
-    count = 0
-    for r in rows_sorted:
-        print(format_row(r))
-        count += 1
-        if limit and count >= limit:
-            break
+    # Entries are usually added in date order, so the file is often sorted
+    # already; every path lists same-date entries newest-added first
+    if _CACHE["date_ordered"] is None:
+        _CACHE["date_ordered"] = all(a.date <= b.date for a, b in zip(rows, rows[1:]))
+    if _CACHE["date_ordered"]:
+        rows_sorted = rows[-limit:][::-1] if limit else rows[::-1]
+    elif limit:
+        rows_sorted = heapq.nlargest(limit, reversed(rows), key=lambda r: r.date)
+    else:
+        rows_sorted = sorted(reversed(rows), key=lambda r: r.date, reverse=True)
+    # One write for the whole listing instead of a print() per row
+    sys.stdout.write("\n".join(map(format_row, rows_sorted)) + "\n")
 
 # Step 11 - Show summary of expenses by category
 def summary_by_category():
-    rows = read_all()
+    rows, paise = read_amounts()
     if not rows:
         print("\nNo expenses to summarize.")
         return
     totals = {}
-    for r in rows:
-        cat = r["category"]
-        amt = Decimal(r["amount"])
-        totals[cat] = totals.get(cat, Decimal("0.00")) + amt
+    skipped = 0
+    for r, p in zip(rows, paise):
+        if p is None:
+            skipped += 1
+            continue
+        totals[r.category] = totals.get(r.category, 0) + p
     print("\nTotal by category:")
     for cat, total in sorted(totals.items(), key=lambda x: x[1], reverse=True):
-        print(f"{cat:12} : ₹{total}")
+        print(f"{cat:{CATEGORY_WIDTH}} : ₹{format_paise(total)}")
+    if skipped:
+        print(f"Skipped {skipped} expense(s) with an invalid amount.")
 
 # Step 12 - Show summary by date range
 def summary_by_date_range():
-    rows = read_all()
+    rows, paise = read_amounts()
     if not rows:
         print("\nNo expenses to summarize.")
         return
@@ -130,66 +259,74 @@ def summary_by_date_range():
     if not s or not e or s > e:
         print("Invalid date range.")
         return
-    total = Decimal("0.00")
-    filtered = []
-    for r in rows:
-        d = parse_date(r["date"])
-        if s <= d <= e:
-            filtered.append(r)
-            total += Decimal(r["amount"])
+    # Loaded dates are canonical (see read_all), so string compare is exact
+    s_str = s.strftime(DATE_FORMAT)
+    e_str = e.strftime(DATE_FORMAT)
+    filtered = [(r, p) for r, p in zip(rows, paise) if s_str <= r.date <= e_str]
     if not filtered:
         print("No expenses in that range.")
         return
+    total = sum(p for _, p in filtered if p is not None)
+    skipped = sum(p is None for _, p in filtered)
     print(f"\nExpenses from {start} to {end}:")
-    for r in sorted(filtered, key=lambda x: x["date"]):
+    for r, _ in sorted(filtered, key=lambda x: x[0].date):
         print(format_row(r))
-    print(f"\nTotal: ₹{total}")
+    print(f"\nTotal: ₹{format_paise(total)}")
+    if skipped:
+        print(f"Skipped {skipped} expense(s) with an invalid amount.")
 
 # Step 13 - Edit an existing expense
 def edit_expense():
     id_prefix = input("Enter expense id (first 8 chars) to edit: ").strip()
-    rows = read_all()
-    for idx, r in enumerate(rows):
-        if r["id"].startswith(id_prefix):
-            print("Current entry:")
-            print(format_row(r))
-            new_date = input(f"Date [{r['date']}]: ").strip() or r["date"]
-            if not parse_date(new_date):
-                print("Invalid date.")
-                return
-            new_cat = input(f"Category [{r['category']}]: ").strip() or r["category"]
-            new_amt = input(f"Amount [{r['amount']}]: ").strip() or r["amount"]
-            new_amt_parsed = parse_amount(new_amt)
-            if new_amt_parsed is None:
-                print("Invalid amount.")
-                return
-            new_desc = input(f"Description [{r['description']}]: ").strip() or r["description"]
-            rows[idx].update({
-                "date": new_date,
-                "category": new_cat,
-                "amount": str(new_amt_parsed),
-                "description": new_desc
-            })
-            write_all(rows)
-            print("Updated successfully.")
-            return
-    print("No matching expense found.")
+    rows, matches = find_by_id(id_prefix)
+    if not matches:
+        print("No matching expense found.")
+        return
+    r = rows[matches[0]]
+    print("Current entry:")
+    print(format_row(r))
+    new_date = input(f"Date [{r.date}]: ").strip() or r.date
+    d = parse_date(new_date)
+    if not d:
+        print("Invalid date.")
+        return
+    new_date = d.strftime(DATE_FORMAT)
+    new_cat = input(f"Category [{r.category}]: ").strip() or r.category
+    new_amt = input(f"Amount [{r.amount}]: ").strip() or r.amount
+    new_amt_parsed = parse_amount(new_amt)
+    if new_amt_parsed is None:
+        print("Invalid amount.")
+        return
+    new_desc = input(f"Description [{r.description}]: ").strip() or r.description
+    updated = r._replace(
+        date=new_date,
+        category=new_cat,
+        amount=str(new_amt_parsed),
+        description=new_desc
+    )
+    # Nothing to rewrite if every field was kept as-is
+    if updated == r:
+        print("No changes made.")
+        return
+    rows[matches[0]] = updated
+    write_all(rows)
+    print("Updated successfully.")
 
 # Step 14 - Delete an expense
 def delete_expense():
     id_prefix = input("Enter expense id (first 8 chars) to delete: ").strip()
-    rows = read_all()
-    matches = [r for r in rows if r["id"].startswith(id_prefix)]
+    rows, matches = find_by_id(id_prefix)
     if not matches:
         print("No matching expense found.")
         return
     print("Found:")
-    for r in matches:
-        print(format_row(r))
+    for idx in matches:
+        print(format_row(rows[idx]))
     confirm = input("Type YES to confirm delete: ").strip()
     if confirm == "YES":
-        new_rows = [r for r in rows if not r["id"].startswith(id_prefix)]
-        write_all(new_rows)
+        for idx in reversed(matches):
+            rows[idx:idx + 1] = []
+        write_all(rows)
         print("Deleted successfully.")
     else:
         print("Cancelled.")
@@ -203,31 +340,48 @@ def export_filtered():
     cat = input("Filter by category (leave blank for all): ").strip()
     start = input("Start date (YYYY-MM-DD) leave blank for none: ").strip()
     end = input("End date (YYYY-MM-DD) leave blank for none: ").strip()
-    filtered = rows
-    if cat:
-        filtered = [r for r in filtered if r["category"].lower() == cat.lower()]
+    cat_lower = cat.lower()
+    s_str = e_str = ""
     if start:
         s = parse_date(start)
         if not s:
             print("Invalid start date.")
             return
-        filtered = [r for r in filtered if parse_date(r["date"]) >= s]
+        s_str = s.strftime(DATE_FORMAT)
     if end:
         e = parse_date(end)
         if not e:
             print("Invalid end date.")
             return
-        filtered = [r for r in filtered if parse_date(r["date"]) <= e]
-    if not filtered:
+        e_str = e.strftime(DATE_FORMAT)
+
+    # Single pass over the rows; read_all() has already zero-padded any legacy
+    # dates, so the stored date strings compare in date order
+    def matching():
+        for r in rows:
+            if cat and r.category.lower() != cat_lower:
+                continue
+            if s_str and r.date < s_str:
+                continue
+            if e_str and r.date > e_str:
+                continue
+            yield r
+
+    filtered = matching()
+    first = next(filtered, None)
+    if first is None:
         print("No matching records.")
         return
     out_name = input("Output CSV filename (default export.csv): ").strip() or "export.csv"
     with open(out_name, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
-        writer.writeheader()
+        writer = csv.writer(f)
+        writer.writerow(CSV_FIELDS)
+        writer.writerow(first)
+        count = 1
         for r in filtered:
             writer.writerow(r)
-    print(f"Exported {len(filtered)} rows to {out_name}.")
+            count += 1
+    print(f"Exported {count} rows to {out_name}.")
 
 # Step 16 - Display main menu
 MENU = textwrap.dedent("""